@@ -1,90 +1,129 @@
 def signal_handler(sig, frame):
-    """Handle SIGTERM and SIGINT for clean shutdown"""
+    """Handle SIGTERM and SIGINT by flagging the main loop to exit"""
+    # Nothing but async-signal-safe work here - logging takes an RLock the
+    # timer thread may hold, so the actual cleanup is deferred to main,
+    # which notices the event within one serial read timeout
+    shutdown_event.set()
+
+def shutdown_cleanup():
+    """Shutdown work deferred from signal_handler to the main loop"""
     global recording_in_progress, current_satellite_code, recording_end_time
-    
+
     logging.info("Shutdown signal received, exiting...")
-    
-    # Terminate any running process
-    if current_process and current_process.poll() is None:
-        try:
-            os.killpg(os.getpgid(current_process.pid), signal.SIGTERM)
-            logging.info("Process terminated on shutdown")
-        except:
-            pass
-    
-    # Reset recording state
-    recording_in_progress = False
-    current_satellite_code = None
-    recording_end_time = None
-    
-    # Close serial port if open
-    if 'ser' in globals() and ser.is_open:
-        ser.close()
-    
-    sys.exit(0)
+
+    with state_lock:
+        # Terminate any running pipeline
+        if current_procs and current_process and current_process.poll() is None:
+            try:
+                terminate_pipeline(current_procs)
+                logging.info("Pipeline terminated on shutdown")
+            except:
+                pass
+
+        # Reset recording state
+        recording_in_progress = False
+        current_satellite_code = None
+        recording_end_time = None
+
     # Serial port configuration
 SERIAL_PORT = '/dev/ttyS0'  
 BAUD_RATE = 9600
 #!/usr/bin/env python3
 import os
+import select
 import signal
 import subprocess
 import sys
 import threading
 import time
-import datetime
 import logging
+import logging.handlers
+import queue
+import selectors
 import serial
 
-# Configure logging
+# Configure logging through a queue - a background listener owns the file
+# and console handlers, so slow SD-card writes never block the serial
+# loop or the timer thread under the logging lock
+_log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("/home/ftyftty/serial_handler.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler("/home/ftyftty/serial_handler.log"),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+
 # Configuration
 RECORDINGS_DIR = "/home/ftyftty/recordings"  # Directory to store recordings
 GDRIVE_REMOTE = "gdrive:"               # rclone remote name
 GDRIVE_FOLDER = "PiShare"  # Folder in Google Drive
-DELETE_AFTER_UPLOAD = True              # Delete local files after successful upload
 SHUTDOWN_AFTER_UPLOAD = True            # Shutdown Pi after successful upload
 
+# Timestamp format for recording filenames
+_TS_FMT = "%Y%m%d_%H%M%S"
+
 # Command dictionary - maps codes to terminal commands and responses
 COMMANDS = {
+    # Simple commands are plain argv lists - no shell, so subprocess can
+    # use the posix_spawn fast path instead of forking the interpreter
     "103": {
-        "command": "uptime", # Get system uptime
+        "command": ["uptime"], # Get system uptime
         "response": "103_ACK",
         "needs_termination": False
     },
     "104": {
-        "command": "sudo shutdown -h now",
+        "command": ["sudo", "shutdown", "-h", "now"],
         "response": "104_ACK",
         "needs_termination": False
     },
+    # Recording pipelines are lists of argv lists - each stage is spawned
+    # directly and wired to the next with a pipe, no /bin/sh in between.
+    # sox writes WAV to stdout and rclone rcat streams it straight to
+    # Google Drive, so the recording never touches the SD card
     "105": {
-        "command": "rtl_fm -f 137.62M -s 60k -g 40 -p 55 -E wav -E deemp -F 9 - | sox -t raw -e signed -c 1 -b 16 -r 60000 - noaa15_{timestamp}.wav rate 11025",
+        "command": [
+            ["rtl_fm", "-f", "137.62M", "-s", "60k", "-g", "40", "-p", "55", "-E", "wav", "-E", "deemp", "-F", "9", "-"],
+            ["sox", "-t", "raw", "-e", "signed", "-c", "1", "-b", "16", "-r", "60000", "-", "-t", "wav", "-", "rate", "11025"],
+            ["rclone", "rcat", GDRIVE_REMOTE + GDRIVE_FOLDER + "/noaa15_{timestamp}.wav", "--drive-shared-with-me"]
+        ],
         "response": "105_NOAA15",
         "needs_termination": True,
         "output_file": "noaa15_{timestamp}.wav"
     },
     "106": {
-        "command": "rtl_fm -f 137.9125M -s 60k -g 40 -p 55 -E wav -E deemp -F 9 - | sox -t raw -e signed -c 1 -b 16 -r 60000 - noaa18_{timestamp}.wav rate 11025",
+        "command": [
+            ["rtl_fm", "-f", "137.9125M", "-s", "60k", "-g", "40", "-p", "55", "-E", "wav", "-E", "deemp", "-F", "9", "-"],
+            ["sox", "-t", "raw", "-e", "signed", "-c", "1", "-b", "16", "-r", "60000", "-", "-t", "wav", "-", "rate", "11025"],
+            ["rclone", "rcat", GDRIVE_REMOTE + GDRIVE_FOLDER + "/noaa18_{timestamp}.wav", "--drive-shared-with-me"]
+        ],
         "response": "106_NOAA18",
         "needs_termination": True,
         "output_file": "noaa18_{timestamp}.wav"
     },
     "107": {
-        "command": "rtl_fm -f 137.10M -s 60k -g 40 -p 55 -E wav -E deemp -F 9 - | sox -t raw -e signed -c 1 -b 16 -r 60000 - noaa19_{timestamp}.wav rate 11025",
+        "command": [
+            ["rtl_fm", "-f", "137.10M", "-s", "60k", "-g", "40", "-p", "55", "-E", "wav", "-E", "deemp", "-F", "9", "-"],
+            ["sox", "-t", "raw", "-e", "signed", "-c", "1", "-b", "16", "-r", "60000", "-", "-t", "wav", "-", "rate", "11025"],
+            ["rclone", "rcat", GDRIVE_REMOTE + GDRIVE_FOLDER + "/noaa19_{timestamp}.wav", "--drive-shared-with-me"]
+        ],
         "response": "107_NOAA19",
         "needs_termination": True,
         "output_file": "noaa19_{timestamp}.wav"
     },
     "108": {
-        "command": "rtl_fm -f 145.80M -s 48k -g 40 -p 55 - | play -r 48000 -t raw -e signed-int -b 16 -c 1 -V1 -",
+        "command": [
+            ["rtl_fm", "-f", "145.80M", "-s", "48k", "-g", "40", "-p", "55", "-"],
+            ["play", "-r", "48000", "-t", "raw", "-e", "signed-int", "-b", "16", "-c", "1", "-V1", "-"]
+        ],
         "response": "108_ISS",
         "needs_termination": True,
         "output_file": "iss_{timestamp}.wav"
@@ -92,131 +131,235 @@ COMMANDS = {
     # Add more commands as needed
 }
 
+def build_argv_templates():
+    """Pre-join the recordings path into each pipeline template so starting
+    a recording only needs the {timestamp} substitution"""
+    for info in COMMANDS.values():
+        if not info.get("needs_termination"):
+            continue
+        out = info.get("output_file")
+        info["argv_template"] = [
+            [os.path.join(RECORDINGS_DIR, arg) if out and arg == out else arg
+             for arg in argv]
+            for argv in info["command"]
+        ]
+
+build_argv_templates()
+
 # Global process tracking
 current_process = None
+current_procs = []
+current_pidfd = None
 timer_thread = None
 recording_in_progress = False
 current_satellite_code = None
 recording_end_time = None
 
+# Guards all of the recording state above - it is touched from the main
+# serial loop, the recording timer thread, and the signal handler
+state_lock = threading.RLock()
+
+# Set by signal_handler; main polls it and runs shutdown_cleanup
+shutdown_event = threading.Event()
+
+# Serial port handle plus outbound message queue - main's event loop is
+# the only thread that ever calls ser.write, so worker threads queue
+# their messages here instead of racing each other on the UART
+ser = None
+tx_queue = queue.SimpleQueue()
+wakeup_w = None
+
+def queue_serial_write(message):
+    """Queue an outbound serial message for main's event loop to send"""
+    tx_queue.put(message.encode('ascii'))
+    # Nudge the selector so the message goes out immediately
+    if wakeup_w is not None:
+        try:
+            os.write(wakeup_w, b"\x00")
+        except OSError:
+            pass
+
+def terminate_pipeline(procs):
+    """Send SIGTERM to every stage of a recording pipeline"""
+    for proc in procs:
+        if proc.poll() is None:
+            try:
+                os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
+            except Exception as e:
+                logging.error("Error killing pipeline process %s: %s", proc.pid, e)
+
 def execute_command(cmd, duration=None, needs_termination=False, command_code=None, output_file=None):
-    """Execute a shell command and return the output"""
-    global current_process, timer_thread, recording_in_progress, current_satellite_code, recording_end_time
-    
+    """Execute a command (shell string or pipeline of argv lists) and return the output"""
+    global current_process, current_procs, current_pidfd, timer_thread, recording_in_progress, current_satellite_code, recording_end_time
+
     try:
         # Special handling for shutdown command
-        if "shutdown" in cmd:
-            logging.info(f"Executing shutdown command: {cmd}")
+        if not needs_termination and "shutdown" in cmd:
+            logging.info("Executing shutdown command: %s", cmd)
             # Return immediately for shutdown command
-            subprocess.Popen(cmd, shell=True)
+            subprocess.Popen(cmd)
             return "Shutdown initiated"
         
         # For commands that run continuously and need termination (satellite recordings)
         if needs_termination:
+            # Snapshot the recording state under the lock so the timer thread
+            # can't flip it between our check and our use of it
+            with state_lock:
+                in_progress = recording_in_progress and current_process and current_process.poll() is None
+                active_code = current_satellite_code
+                end_time = recording_end_time
+
             # Check if recording is already in progress
-            if recording_in_progress and current_process and current_process.poll() is None:
+            if in_progress:
                 # Calculate remaining time for current recording
                 now = time.time()
-                remaining_seconds = max(0, recording_end_time - now)
-                
-                logging.warning(f"Recording already in progress for satellite {current_satellite_code}")
-                logging.warning(f"Remaining time: {int(remaining_seconds)} seconds")
-                
+                remaining_seconds = max(0, end_time - now)
+
+                logging.warning("Recording already in progress for satellite %s", active_code)
+                logging.warning("Remaining time: %d seconds", remaining_seconds)
+
                 # Only if this is a different satellite code, log the conflict
-                if command_code != current_satellite_code:
-                    conflict_message = f"Ignoring new recording request for {command_code} to avoid interrupting current recording of {current_satellite_code}"
+                if command_code != active_code:
+                    conflict_message = f"Ignoring new recording request for {command_code} to avoid interrupting current recording of {active_code}"
                     logging.warning(conflict_message)
                     return f"Cannot start: {conflict_message}"
                 else:
                     # Same satellite being requested again
-                    return f"Already recording satellite {current_satellite_code} for {int(remaining_seconds)} more seconds"
-            
+                    return f"Already recording satellite {active_code} for {int(remaining_seconds)} more seconds"
+
             # No conflict, proceed with recording
-            # Kill any existing process (this happens only if recording_in_progress is False)
-            if current_process and current_process.poll() is None:
-                try:
-                    logging.info("Terminating existing process")
-                    os.killpg(os.getpgid(current_process.pid), signal.SIGTERM)
-                except Exception as e:
-                    logging.error(f"Error killing previous process: {e}")
-            
-            # Cancel any existing timer
-            if timer_thread and timer_thread.is_alive():
-                logging.info("Cancelling existing timer")
-                timer_thread.cancel()
-            
-            # Ensure recordings directory exists
-            if output_file and not os.path.exists(RECORDINGS_DIR):
-                os.makedirs(RECORDINGS_DIR)
-            
-            # Generate timestamp for filename
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Replace the {timestamp} placeholder in the command and output filename
+            with state_lock:
+                # Kill any existing pipeline (this happens only if recording_in_progress is False)
+                if current_procs and current_process and current_process.poll() is None:
+                    logging.info("Terminating existing pipeline")
+                    terminate_pipeline(current_procs)
+
+                # Cancel any existing timer
+                if timer_thread and timer_thread.is_alive():
+                    logging.info("Cancelling existing timer")
+                    timer_thread.cancel()
+
+            # Generate timestamp for filename (UTC, so no DST surprises);
+            # main already made sure the recordings directory exists
+            timestamp = time.strftime(_TS_FMT, time.gmtime())
+
             if output_file:
                 output_file = output_file.replace("{timestamp}", timestamp)
-                full_path = os.path.join(RECORDINGS_DIR, output_file)
-                # Replace both the timestamp placeholder and the output file in the command
-                cmd = cmd.replace("{timestamp}", timestamp)
-                if "{timestamp}" not in cmd:  # If timestamp was not in original command
-                    # Replace the output file in the command
-                    base_output = os.path.basename(output_file)
-                    for part in base_output.split("{timestamp}"):
-                        if part in cmd:
-                            cmd = cmd.replace(part, os.path.join(RECORDINGS_DIR, part))
-                else:
-                    # The timestamp was already handled, now handle the path
-                    cmd = cmd.replace(output_file, full_path)
-            
-            # Start the new process
-            logging.info(f"Starting command with duration {duration} seconds: {cmd}")
-            logging.info(f"Output file will be: {output_file}")
-            
-            # Run in separate process group so we can kill all child processes later
-            current_process = subprocess.Popen(
-                cmd, 
-                shell=True, 
-                preexec_fn=os.setsid,
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
-            
-            # Store the output file for upload
-            current_output_file = output_file
-            
-            # Mark recording as in progress
-            recording_in_progress = True
-            current_satellite_code = command_code
-            
-            # Calculate when recording will end
-            recording_end_time = time.time() + duration if duration else None
+
+            # Templates are pre-tokenized at import time with the output path
+            # already joined in - just stamp the timestamp into each stage
+            stages = [
+                [arg.replace("{timestamp}", timestamp) if "{timestamp}" in arg else arg
+                 for arg in argv]
+                for argv in cmd
+            ]
+
+            # Start the new pipeline
+            logging.info("Starting pipeline with duration %s seconds: %s", duration, stages)
+            logging.info("Output file will be: %s", output_file)
+
+            with state_lock:
+                # Spawn each stage directly (no /bin/sh) and wire them together
+                # with pipes; each stage gets its own session so terminate_pipeline
+                # can killpg per stage
+                procs = []
+                prev_stdout = None
+                for stage in stages:
+                    proc = subprocess.Popen(
+                        stage,
+                        stdin=prev_stdout,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        start_new_session=True
+                    )
+                    if prev_stdout:
+                        # Parent's copy of the pipe end; the child owns it now
+                        prev_stdout.close()
+                    prev_stdout = proc.stdout
+                    procs.append(proc)
+
+                current_procs = procs
+                current_process = procs[-1]
+
+                # Waitable fd on the final stage (Linux 5.3+) - it polls
+                # readable once the process has exited, so the timer can
+                # block on it precisely instead of poll-sleeping
+                if current_pidfd is not None:
+                    try:
+                        os.close(current_pidfd)
+                    except OSError:
+                        pass
+                try:
+                    current_pidfd = os.pidfd_open(current_process.pid)
+                except OSError:
+                    current_pidfd = None
+
+                # Store the output file for the upload notification
+                current_output_file = output_file
+                streams_upload = stages[-1][0] == "rclone"
+
+                # Mark recording as in progress
+                recording_in_progress = True
+                current_satellite_code = command_code
+
+                # Calculate when recording will end
+                recording_end_time = time.time() + duration if duration else None
             
             # If duration provided, set up a timer to kill the process
             if duration:
                 def terminate_and_upload():
                     global recording_in_progress, current_satellite_code, recording_end_time
-                    
+
                     try:
-                        if current_process and current_process.poll() is None:
-                            logging.info(f"Timer expired after {duration} seconds, terminating process")
-                            os.killpg(os.getpgid(current_process.pid), signal.SIGTERM)
-                            logging.info("Process terminated")
-                            
-                            # Wait a moment for files to be properly closed
-                            time.sleep(2)
-                            
-                            # Upload the recording to Google Drive if output_file was specified
-                            if current_output_file and command_code:
-                                full_path = os.path.join(RECORDINGS_DIR, current_output_file)
-                                upload_result = upload_to_gdrive(full_path, command_code)
-                                logging.info(f"Upload result: {upload_result}")
+                        with state_lock:
+                            was_running = current_process and current_process.poll() is None
+                            if was_running:
+                                logging.info("Timer expired after %s seconds, stopping the SDR stage", duration)
+                                # Only SIGTERM the first stage - sox and rclone
+                                # see EOF, flush, and finish the upload themselves
+                                first = current_procs[0]
+                                if first.poll() is None:
+                                    os.killpg(os.getpgid(first.pid), signal.SIGTERM)
+
+                        if was_running:
+                            # Wait for the tail of the pipeline (the streamed
+                            # upload) to drain and exit
+                            if current_pidfd is not None:
+                                # True blocking wait on the pidfd - unlike
+                                # Popen.wait(timeout), this doesn't poll-sleep
+                                ready, _, _ = select.select([current_pidfd], [], [], 300)
+                                if not ready:
+                                    logging.error("Pipeline did not drain in time, terminating it")
+                                    terminate_pipeline(current_procs)
+                                current_process.wait(timeout=30)
+                            else:
+                                try:
+                                    current_process.wait(timeout=300)
+                                except subprocess.TimeoutExpired:
+                                    logging.error("Pipeline did not drain in time, terminating it")
+                                    terminate_pipeline(current_procs)
+
+                        # Notify once the streamed upload has finished
+                        if was_running and streams_upload and current_output_file and command_code:
+                            logging.info("Streamed upload finished: %s", current_output_file)
+                            queue_serial_write(f"UPLOAD_SUCCESS:{command_code}:{current_output_file}\n")
+
+                            # Trigger shutdown if configured
+                            if SHUTDOWN_AFTER_UPLOAD:
+                                logging.info("Initiating shutdown after successful upload...")
+                                # Notify Arduino first
+                                queue_serial_write("SHUTDOWN_INITIATED:Upload complete\n")
+                                time.sleep(2)  # Give Arduino time to process the message
+                                # Schedule shutdown with a short delay
+                                subprocess.Popen(["sudo", "shutdown", "-h", "+1"])
                     except Exception as e:
-                        logging.error(f"Error in timer thread: {e}")
+                        logging.error("Error in timer thread: %s", e)
                     finally:
                         # Reset recording status
-                        recording_in_progress = False
-                        current_satellite_code = None
-                        recording_end_time = None
+                        with state_lock:
+                            recording_in_progress = False
+                            current_satellite_code = None
+                            recording_end_time = None
                 
                 # Create and start the timer
                 timer_thread = threading.Timer(duration, terminate_and_upload)
@@ -227,81 +370,22 @@ def execute_command(cmd, duration=None, needs_termination=False, command_code=No
         
         # For simple commands that don't run continuously
         else:
-            result = subprocess.check_output(cmd, shell=True, text=True, timeout=5)
-            logging.info(f"Command executed: {cmd}")
+            result = subprocess.check_output(cmd, text=True, timeout=5)
+            logging.info("Command executed: %s", cmd)
             return result.strip()
             
     except subprocess.TimeoutExpired:
         return "Command timed out"
     except subprocess.CalledProcessError as e:
-        logging.error(f"Command failed: {e}")
+        logging.error("Command failed: %s", e)
         return f"Error: {e}"
     except Exception as e:
-        logging.error(f"Error executing command: {e}")
+        logging.error("Error executing command: %s", e)
         return f"Error: {e}"
 
-def upload_to_gdrive(file_path, command_code):
-    """Upload a file to Google Drive using rclone"""
-    global recording_in_progress, current_satellite_code, recording_end_time
-    
-    if not os.path.exists(file_path):
-        logging.error(f"File not found for upload: {file_path}")
-        return "File not found"
-    
-    try:
-        # Extract just the filename from the path
-        filename = os.path.basename(file_path)
-        
-        # Upload the file with rclone
-        upload_command = f"rclone copy '{file_path}' {GDRIVE_REMOTE}{GDRIVE_FOLDER} --drive-shared-with-me"
-        logging.info(f"Uploading file to Google Drive: {upload_command}")
-        
-        result = subprocess.run(upload_command, shell=True, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            logging.info(f"Successfully uploaded {file_path} to Google Drive")
-                # Force reset recording status after successful upload
-            recording_in_progress = False
-            current_satellite_code = None
-            recording_end_time = None
-            
-            # Delete local file if configured to do so
-            if DELETE_AFTER_UPLOAD:
-                try:
-                    os.remove(file_path)
-                    logging.info(f"Deleted local file: {file_path}")
-                except Exception as e:
-                    logging.error(f"Failed to delete local file: {e}")
-            
-            # Send notification via serial
-            response = f"UPLOAD_SUCCESS:{command_code}:{filename}"
-            if 'ser' in globals() and ser.is_open:
-                ser.write(f"{response}\n".encode('ascii'))
-            
-            # Trigger shutdown if configured and no recording is in progress
-            if SHUTDOWN_AFTER_UPLOAD and not recording_in_progress:
-                logging.info("Initiating shutdown after successful upload...")
-                # Notify Arduino first
-                if 'ser' in globals() and ser.is_open:
-                    ser.write(f"SHUTDOWN_INITIATED:Upload complete\n".encode('ascii'))
-                    time.sleep(2)  # Give Arduino time to process the message
-                
-                # Schedule shutdown with a short delay
-                subprocess.Popen("sudo shutdown -h +1", shell=True)
-                return f"Uploaded to Google Drive and initiating shutdown"
-            
-            return f"Uploaded to Google Drive: {filename}"
-        else:
-            logging.error(f"Failed to upload file: {result.stderr}")
-            return f"Upload failed: {result.stderr[:50]}"
-    
-    except Exception as e:
-        logging.error(f"Error during upload: {e}")
-        return f"Upload error: {str(e)[:50]}"
-
 def main():
-    global ser
-    
+    global ser, wakeup_w, recording_in_progress, current_satellite_code, recording_end_time
+
     # Set up signal handlers for clean shutdown
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
@@ -311,31 +395,29 @@ def main():
         # Create recordings directory if it doesn't exist
         if not os.path.exists(RECORDINGS_DIR):
             os.makedirs(RECORDINGS_DIR)
-            logging.info(f"Created recordings directory: {RECORDINGS_DIR}")
+            logging.info("Created recordings directory: %s", RECORDINGS_DIR)
             
         # Test rclone configuration
         try:
             subprocess.run(
-                f"rclone lsd {GDRIVE_REMOTE}", 
-                shell=True, 
-                check=True, 
-                stdout=subprocess.PIPE, 
+                ["rclone", "lsd", GDRIVE_REMOTE],
+                check=True,
+                stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
             )
             logging.info("rclone connection to Google Drive verified")
-            
+
             # Create the destination folder if it doesn't exist
             subprocess.run(
-                f"rclone mkdir {GDRIVE_REMOTE}{GDRIVE_FOLDER}", 
-                shell=True, 
-                check=True, 
-                stdout=subprocess.PIPE, 
+                ["rclone", "mkdir", f"{GDRIVE_REMOTE}{GDRIVE_FOLDER}"],
+                check=True,
+                stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
             )
-            logging.info(f"Verified Google Drive folder: {GDRIVE_FOLDER}")
+            logging.info("Verified Google Drive folder: %s", GDRIVE_FOLDER)
         except subprocess.CalledProcessError:
             logging.error("Failed to verify rclone configuration. Google Drive uploads may not work.")
-        
+
         # Open serial connection with explicit settings
         ser = serial.Serial(
             port=SERIAL_PORT,
@@ -346,7 +428,7 @@ def main():
             timeout=1
         )
         
-        logging.info(f"Serial connection opened on {SERIAL_PORT} at {BAUD_RATE} baud")
+        logging.info("Serial connection opened on %s at %s baud", SERIAL_PORT, BAUD_RATE)
         
         # Clear any initial data
         ser.reset_input_buffer()
@@ -358,65 +440,103 @@ def main():
         ser.write(ready_message.encode('ascii'))
         logging.info("Sent ready signal to Arduino")
         
+        # Wakeup pipe so a signal interrupts the selector immediately
+        # instead of waiting out a serial timeout
+        wakeup_r, wakeup_w = os.pipe()
+        os.set_blocking(wakeup_w, False)
+        signal.set_wakeup_fd(wakeup_w)
+
+        # Event-driven loop: epoll on the serial fd (and the wakeup pipe)
+        # replaces the old poll-and-sleep pattern
+        sel = selectors.DefaultSelector()
+        sel.register(ser.fileno(), selectors.EVENT_READ)
+        sel.register(wakeup_r, selectors.EVENT_READ)
+
         # Buffer to store incoming data
-        buffer = ""
-        
+        buffer = b""
+
         while True:
-            # Read data if available
-            if ser.in_waiting > 0:
+            # Deferred signal handling - the handler only sets the event
+            if shutdown_event.is_set():
+                shutdown_cleanup()
+                break
+
+            for key, _ in sel.select():
+                if key.fd == wakeup_r:
+                    # Drain the signal wakeup byte(s)
+                    os.read(wakeup_r, 4096)
+                    continue
+                # The port is readable - pull everything that's arrived
+                buffer += ser.read(ser.in_waiting or 1)
+
+            # Drain messages queued by worker threads - a single batched
+            # write keeps the UART output from interleaving
+            chunks = []
+            while True:
                 try:
-                    # Read a line (until newline character)
-                    line = ser.readline().decode('ascii', errors='replace').strip()
-                    
-                    if line:  # Only process non-empty lines
-                        logging.info(f"Received command: {line}")
-                        
-                        # Check if command contains duration (format: "CODE:DURATION")
-                        parts = line.split(":")
-                        code = parts[0]
-                        duration = int(parts[1]) if len(parts) > 1 else None
-                        
-                        # Process the command
-                        if code in COMMANDS:
-                            cmd_info = COMMANDS[code]
-                            
-                            # Check if this is a force stop command (104 - shutdown)
-                            if code == "104":
-                                # Reset recording status for shutdown
+                    chunks.append(tx_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if chunks:
+                ser.write(b"".join(chunks))
+
+            # Process every complete line in the buffer
+            while b"\n" in buffer:
+                raw_line, buffer = buffer.split(b"\n", 1)
+                line = raw_line.decode('ascii', errors='replace').strip()
+
+                if not line:
+                    continue
+
+                try:
+                    logging.info("Received command: %s", line)
+
+                    # Command codes are three ASCII digits, optionally followed
+                    # by ":DURATION" - slice instead of allocating a split list,
+                    # and treat a garbage duration as absent rather than raising
+                    # (serial noise at 9600 baud with no parity is common)
+                    code = line[:3]
+                    rest = line[4:] if len(line) > 3 and line[3] == ':' else ''
+                    duration = int(rest) if rest.isdigit() else None
+                    cmd_info = COMMANDS.get(code)
+
+                    # Process the command
+                    if cmd_info is not None:
+                        # Check if this is a force stop command (104 - shutdown)
+                        if code == "104":
+                            # Reset recording status for shutdown
+                            with state_lock:
                                 recording_in_progress = False
                                 current_satellite_code = None
                                 recording_end_time = None
-                            
-                            # Execute the command with duration if provided
-                            cmd_output = execute_command(
-                                cmd_info["command"], 
-                                duration, 
-                                cmd_info.get("needs_termination", False),
-                                code,
-                                cmd_info.get("output_file", None)
-                            )
-                            
-                            # Send response
-                            response = f"{cmd_info['response']}:{cmd_output[:50]}\n"
-                            ser.write(response.encode('ascii'))
-                            logging.info(f"Sent response: {response.strip()}")
-                        else:
-                            # Unknown command
-                            ser.write(f"UNKNOWN_CODE:{line}\n".encode('ascii'))
-                            logging.warning(f"Unknown command received: {line}")
-                            
+
+                        # Execute the command with duration if provided
+                        cmd_output = execute_command(
+                            cmd_info.get("argv_template", cmd_info["command"]),
+                            duration,
+                            cmd_info.get("needs_termination", False),
+                            code,
+                            cmd_info.get("output_file", None)
+                        )
+
+                        # Send response
+                        response = f"{cmd_info['response']}:{cmd_output[:50]}\n"
+                        ser.write(response.encode('ascii'))
+                        logging.info("Sent response: %s", response.strip())
+                    else:
+                        # Unknown command
+                        ser.write(f"UNKNOWN_CODE:{line}\n".encode('ascii'))
+                        logging.warning("Unknown command received: %s", line)
+
                 except Exception as e:
-                    logging.error(f"Error processing command: {e}")
-            
-            # Small delay to prevent CPU hogging
-            time.sleep(0.1)
-            
+                    logging.error("Error processing command: %s", e)
+
     except KeyboardInterrupt:
         logging.info("Program terminated by user")
     except Exception as e:
-        logging.error(f"Error: {e}")
+        logging.error("Error: %s", e)
     finally:
-        if 'ser' in locals() and ser.is_open:
+        if ser is not None and ser.is_open:
             ser.close()
             logging.info("Serial connection closed")
 
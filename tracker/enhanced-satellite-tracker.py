@@ -1,30 +1,138 @@
 #!/usr/bin/env python3
 
 import os
-import random
 import time
 import json
 import ephem
 import datetime
+import hashlib
+import pickle
 import argparse
+import bisect
+import concurrent.futures
 import subprocess
+import threading
+from itertools import islice
 from pathlib import Path
 import paho.mqtt.client as mqtt
 import logging
+import logging.handlers
+import math
+import mmap
+import queue
+import re
 import sys
 import urllib.request
 
+# Optional fast path: vectorized SGP4 propagation over the whole satellite
+# set at once. Falls back to the per-satellite PyEphem loop when sgp4 or
+# numpy aren't installed.
+try:
+    import numpy as np
+    from sgp4.api import Satrec, SatrecArray, jday
+    from sgp4.api import accelerated as SGP4_ACCELERATED
+    HAVE_SGP4 = True
+except ImportError:
+    HAVE_SGP4 = False
+    SGP4_ACCELERATED = False
+
+# Hoisted unit conversions for the per-pass hot path: one multiply each,
+# and real pi instead of the truncated 3.14159
+_DEG = 180.0 / math.pi
+_SEC_PER_DAY = 86400.0
+
+# orjson emits UTF-8 bytes a few times faster than stdlib json and paho
+# accepts bytes payloads directly; fall back to stdlib when it isn't
+# installed. Decode errors from either implementation are ValueError.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    def _loads(data):
+        return json.loads(data)
+
+# One compiled scan per name replaces the chains of substring checks the
+# category/frequency/mode lookups each ran per satellite. The pattern set
+# is small enough that re's alternation covers it without pulling in an
+# Aho-Corasick dependency. lastgroup names the alternative that matched.
+_CATEGORY_RE = re.compile(
+    r"(?P<NOAA>NOAA)|(?P<METEOR>METEOR)|(?P<ISS>^ISS$|ISS \(ZARYA\))|"
+    r"(?P<AMSAT>AO-|SO-|FO-|XW-)|(?P<GOES>GOES)")
+
+# Frequency/mode defaults match ISS loosely (any name containing it), so
+# they get their own automaton plus tag->value tables
+_RADIO_RE = re.compile(
+    r"(?P<NOAA>NOAA)|(?P<METEOR>METEOR)|(?P<ISS>ISS)|(?P<AMSAT>AO-|SO-|FO-|XW-)")
+_DEFAULT_FREQS = {
+    "NOAA": 137.5e6,    # Generic NOAA APT frequency
+    "METEOR": 137.1e6,  # Generic Meteor LRPT frequency
+    "ISS": 145.8e6,     # ISS voice frequency
+    "AMSAT": 145.9e6    # Generic amateur satellite frequency
+}
+_DEFAULT_MODES = {
+    "NOAA": "apt",
+    "METEOR": "lrpt",
+    "AMSAT": "linear"  # Generic amateur satellite mode
+}
+
+# Reusable per-thread payload buffer: publish paths assemble and trim
+# payloads in place here instead of allocating fresh buffers per publish.
+# paho keeps a reference to the payload for its out-queue, so only an
+# immutable bytes() snapshot is handed over at the end.
+_tls = threading.local()
+
+def _payload_buf():
+    buf = getattr(_tls, "buf", None)
+    if buf is None:
+        buf = _tls.buf = bytearray()
+    buf.clear()
+    return buf
+
+# Arduino command code per satellite; mirrors the COMMANDS table in the
+# field Pi serial handler
+SATELLITE_CMD_CODES = {
+    "NOAA 15": 105,
+    "NOAA 18": 106,
+    "NOAA 19": 107,
+    "ISS (ZARYA)": 108
+}
+
+# Fixed category order for the structure-of-arrays satellite layout:
+# categories are stored as small integer codes indexing this tuple
+_CATEGORIES = ("NOAA", "METEOR", "ISS", "AMSAT", "GOES", "OTHER")
+_CATEGORY_CODES = {name: code for code, name in enumerate(_CATEGORIES)}
+
+if HAVE_SGP4:
+    # Category multipliers in _CATEGORIES order; mirrors the table in
+    # calculate_pass_priority for the vectorized scoring pass
+    _CAT_MULT = np.array([1.2, 1.5, 1.3, 1.0, 0.8, 0.7])
+
 class EnhancedSatelliteTracker:
     def __init__(self, config_file=None):
-        # Set up logging
+        # Set up logging. Records go through a queue to a listener thread
+        # that owns the file and stream handlers, so MQTT callbacks and the
+        # prediction loop never block on disk I/O
+        log_queue = queue.Queue(-1)
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler("/Users/ryanrotella/satellite/sat_tracker.log"),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=[logging.handlers.QueueHandler(log_queue)]
         )
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler("/Users/ryanrotella/satellite/sat_tracker.log")
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler)
+        self._log_listener.start()
         self.logger = logging.getLogger("SatelliteTracker")
         
         if config_file:
@@ -74,6 +182,9 @@ class EnhancedSatelliteTracker:
                 }
             }
         
+        # Build derived config lookups once rather than per pass
+        self._refresh_config_caches()
+
         # Create observer for PyEphem calculations
         self.observer = ephem.Observer()
         self.update_observer()
@@ -82,6 +193,26 @@ class EnhancedSatelliteTracker:
         self.tracked_passes = {}  # Track specific passes
         self.scheduled_passes = []
         self.next_pass_time = None
+        self._next_idx = 0  # Pointer to the next pass yet to rise
+        self._rise_ts_keys = []  # rise_ts per pass, for bisecting the pointer
+        self._last_schedule_hash = None  # Digest of the last published schedule
+        self._pending_pubs = []  # (topic, message) queued during a tick
+        self._iso_t = 0  # Second-granularity cache for emitted timestamps
+        self._iso_s = ""
+        # Satellite name <-> small integer id for the compact schedule
+        # encoding; grown lazily so ids stay stable across refreshes
+        self._sat_table = {}
+        self._sat_table_names = []
+        self._sat_array = None
+        self._satrec_names = []
+        self._satrecs = []
+        self._sat_freqs = None
+        self._sat_categories = None
+        self._sat_modes = []
+        # Name -> frequency/mode memos; the lookups scan the configured
+        # frequency table, so each name is resolved at most once
+        self._freq_cache = {}
+        self._mode_cache = {}
         
         # Discover TLE files and satellite lists
         self.discover_satellites()
@@ -98,11 +229,43 @@ class EnhancedSatelliteTracker:
         except Exception as e:
             self.logger.error(f"Error loading configuration: {e}")
             self.logger.info("Using default configuration")
+
+    def _refresh_config_caches(self):
+        """Rebuild lookups derived from the config; call after (re)loading it"""
+        # None means notification_satellites wasn't configured at all, which
+        # keeps the legacy notify-for-every-pass behavior
+        notify = self.config.get("notification_satellites")
+        self._notify_set = frozenset(notify) if notify is not None else None
+        # Observer coordinates are static per config; published once as a
+        # retained status/location message rather than per schedule
+        self._schedule_location = {
+            "lat": self.config["observer"]["lat"],
+            "lon": self.config["observer"]["lon"]
+        }
+        # MQTT settings used on every publish, bound once instead of
+        # chained dict lookups per call
+        mqtt_cfg = self.config["mqtt"]
+        self._topic_prefix = mqtt_cfg["topic_prefix"]
+        self._max_payload_size = mqtt_cfg.get("max_payload_size", 65000)
+        self._qos = mqtt_cfg.get("qos", 0)
+        self._power_topic = mqtt_cfg.get("power_control_topic")
+        # Fully-resolved topic names for everything we publish to; dynamic
+        # topics get memoized here on first use so the prefix check and
+        # f-string run at most once per distinct topic
+        self._resolved_topics = {
+            name: f"{self._topic_prefix}{name}"
+            for name in ("command", "schedule", "status")
+        }
+        if self._power_topic:
+            # Power control goes out exactly as configured, never prefixed
+            self._resolved_topics[self._power_topic] = self._power_topic
     
     def init_mqtt(self):
         """Initialize MQTT client and connection with robust reconnection for Shiftr.io"""
         base_id = self.config['mqtt']['client_id']
-        unique_suffix = ''.join(random.choices('0123456789abcdef', k=8))
+        # One urandom call instead of eight Mersenne Twister draws, and a
+        # properly random suffix if the broker keys on client_id uniqueness
+        unique_suffix = os.urandom(4).hex()
         client_id = f"{base_id}_{unique_suffix}"
         self.logger.info(f"Initializing MQTT with client ID: {client_id}")
         
@@ -129,6 +292,15 @@ class EnhancedSatelliteTracker:
         self.reconnect_count = 0
         self.max_reconnect_count = 20  # Higher limit for persistent retries
         self.reconnect_delay = 1  # Initial delay in seconds
+
+        # Publish flow control: let paho keep a window of messages in
+        # flight and throttle bulk publishes only when the broker falls
+        # behind, instead of sleeping a fixed delay per batch
+        self.mqtt_client.max_inflight_messages_set(20)
+        self._inflight_lock = threading.Lock()
+        self._inflight = 0
+        self._pub_window = threading.Event()  # Set while the window has room
+        self._pub_window.set()
         
         # Configure credentials if provided
         if self.config["mqtt"]["username"]:
@@ -153,6 +325,19 @@ class EnhancedSatelliteTracker:
                         client.subscribe(f"{self.config['mqtt']['power_control_topic']}/status")
                 except Exception as e:
                     self.logger.error(f"Error subscribing to topics: {e}")
+
+                # Observer location is static per tracker; publish it once
+                # retained so subscribers pick it up on demand and the
+                # recurring schedule payloads don't have to carry it
+                try:
+                    client.publish(
+                        f"{self._topic_prefix}status/location",
+                        _dumps(self._schedule_location),
+                        qos=1,
+                        retain=True
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error publishing retained location: {e}")
             else:
                 self.mqtt_connected = False
                 error_messages = {
@@ -182,24 +367,35 @@ class EnhancedSatelliteTracker:
         def on_message(client, userdata, msg, properties=None):
             try:
                 topic = msg.topic
-                payload_str = msg.payload.decode('utf-8')
-                
-                # Try to parse as JSON, but handle non-JSON payloads gracefully
+
+                # Parse straight from the payload bytes - no UTF-8 decode
+                # pass on the paho network thread. Only decode when the
+                # payload turns out not to be JSON
                 try:
-                    payload = json.loads(payload_str)
-                except json.JSONDecodeError:
+                    payload = _loads(msg.payload)
+                except ValueError:
                     # If not valid JSON, use the raw string as payload
                     self.logger.debug(f"Received non-JSON payload on topic {topic}")
-                    payload = payload_str
-                    
+                    payload = msg.payload.decode('utf-8', errors='replace')
+
                 self.handle_message(topic, payload)
             except Exception as e:
                 self.logger.error(f"Error handling message on topic {msg.topic}: {e}")
         
+        def on_publish(client, userdata, mid, reason_code=None, properties=None):
+            # Runs on the network thread; reopen the publish window once
+            # the in-flight count drops back to half capacity
+            with self._inflight_lock:
+                if self._inflight > 0:
+                    self._inflight -= 1
+                if self._inflight <= 10:
+                    self._pub_window.set()
+
         # Configure client callbacks
         self.mqtt_client.on_connect = on_connect
         self.mqtt_client.on_disconnect = on_disconnect
         self.mqtt_client.on_message = on_message
+        self.mqtt_client.on_publish = on_publish
         
         # Set up automatic reconnect with exponential backoff
         self.mqtt_client.reconnect_delay_set(
@@ -207,11 +403,12 @@ class EnhancedSatelliteTracker:
             max_delay=self.config["mqtt"].get("reconnect_delay", 120)  # Increased max delay
         )
         
-        # Use a smaller, simpler last will message
+        # Use a smaller, simpler last will message. Serialized once here -
+        # the timestamp just records when this session was set up
         status_topic = f"{self.config['mqtt']['topic_prefix']}status"
-        will_payload = json.dumps({
-            "status": "offline", 
-            "timestamp": datetime.datetime.now().isoformat()
+        will_payload = _dumps({
+            "status": "offline",
+            "timestamp": self._now_iso()
         })
         
         # Set last will message with QoS 0 for reliability
@@ -238,8 +435,10 @@ class EnhancedSatelliteTracker:
         try:
             self.logger.info(f"Connecting to MQTT broker at {self.config['mqtt']['broker']}:{self.config['mqtt']['port']}")
             
-            # Get keepalive value from config or use default (increased for better stability)
-            keepalive = self.config["mqtt"].get("keepalive", 120)  # Increased from 60 to 120
+            # Get keepalive value from config or use a short default: the
+            # tracker is idle for hours between passes, and frequent pings
+            # keep the socket warm so publishes never stall on a reconnect
+            keepalive = self.config["mqtt"].get("keepalive", 30)
             
             # Connect with configured parameters
             self.mqtt_client.connect_async(
@@ -264,19 +463,39 @@ class EnhancedSatelliteTracker:
         """Handle incoming MQTT messages"""
         try:
             topic = msg.topic
-            payload = json.loads(msg.payload.decode('utf-8'))
+            payload = _loads(msg.payload)
             self.handle_message(topic, payload)
-        except json.JSONDecodeError:
+        except ValueError:
             self.logger.error(f"Error decoding JSON from topic {msg.topic}")
         except Exception as e:
             self.logger.error(f"Error handling message: {e}")
     
-    def update_observer(self):
-        """Update the observer with configuration values"""
+    def update_observer(self, when=None):
+        """Update the observer with configuration values.
+
+        Callers that loop over satellites pass a single `when` so every
+        satellite sees the same epoch instead of a drifting now().
+        """
         self.observer.lat = str(self.config["observer"]["lat"])
         self.observer.lon = str(self.config["observer"]["lon"])
         self.observer.elevation = self.config["observer"]["elevation"]
-        self.observer.date = datetime.datetime.now(datetime.UTC)
+        self.observer.date = when if when is not None else datetime.datetime.now(datetime.UTC)
+
+        # Precompute the site's ECEF position (WGS84) and horizon trig once -
+        # every satellite in the vectorized path shares these, so there's no
+        # reason to rebuild them inside the prediction loop
+        lat = math.radians(self.config["observer"]["lat"])
+        lon = math.radians(self.config["observer"]["lon"])
+        alt_km = self.config["observer"]["elevation"] / 1000.0
+        a_e = 6378.137
+        e2 = 0.00669437999014
+        n_e = a_e / math.sqrt(1.0 - e2 * math.sin(lat) ** 2)
+        self._site_ecef = (
+            (n_e + alt_km) * math.cos(lat) * math.cos(lon),
+            (n_e + alt_km) * math.cos(lat) * math.sin(lon),
+            (n_e * (1.0 - e2) + alt_km) * math.sin(lat)
+        )
+        self._site_trig = (math.sin(lat), math.cos(lat), math.sin(lon), math.cos(lon))
     
     def discover_satellites(self):
         """Discover available satellites from TLE files"""
@@ -297,33 +516,86 @@ class EnhancedSatelliteTracker:
         self.satellites = {}
         all_satellites = []
         
+        # Parsed records are cached in a pickle sidecar keyed by
+        # (mtime, size, md5), so files Celestrak didn't actually change
+        # skip the split/categorize work on the next discovery
+        cache_path = os.path.join(gpredict_data, ".tle_cache.pkl")
+        try:
+            with open(cache_path, 'rb') as f:
+                tle_cache = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            tle_cache = {}
+        cache_dirty = False
+
         # Process TLE files and collect satellite names
         try:
             tle_files = os.listdir(gpredict_data)
             for tle_file in tle_files:
+                if tle_file.startswith('.'):
+                    continue  # Skip the cache sidecar and other dotfiles
                 tle_path = os.path.join(gpredict_data, tle_file)
                 try:
-                    with open(tle_path, 'r') as f:
-                        lines = f.readlines()
-                        i = 0
-                        while i < len(lines) - 2:
-                            name = lines[i].strip()
-                            line1 = lines[i+1].strip()
-                            line2 = lines[i+2].strip()
-                            
-                            # Add satellite to our list
-                            all_satellites.append({
-                                "name": name,
-                                "line1": line1,
-                                "line2": line2,
-                                "category": self.categorize_satellite(name),
-                                "file": tle_file
-                            })
-                            i += 3
+                    stat = os.stat(tle_path)
+                    cached = tle_cache.get(tle_file)
+                    if (cached and cached["mtime"] == stat.st_mtime and
+                            cached["size"] == stat.st_size):
+                        all_satellites.extend(cached["records"])
+                        continue
+
+                    # Map the file and split it once instead of looping over
+                    # readlines(); TLEs are a strict 3-line record format, so
+                    # stride-3 slices give us the name/line1/line2 columns
+                    with open(tle_path, 'rb') as f:
+                        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        data = mm[:]
+                        mm.close()
+
+                    digest = hashlib.md5(data).hexdigest()
+                    if cached and cached["md5"] == digest:
+                        # Rewritten with identical bytes (a common Celestrak
+                        # refresh); just refresh the stat info
+                        cached["mtime"] = stat.st_mtime
+                        cached["size"] = stat.st_size
+                        cache_dirty = True
+                        all_satellites.extend(cached["records"])
+                        continue
+
+                    lines = data.split(b'\n')
+                    names = lines[0::3]
+                    l1s = lines[1::3]
+                    l2s = lines[2::3]
+                    records = []
+                    for name, line1, line2 in zip(names, l1s, l2s):
+                        name = name.decode('ascii', 'replace').strip()
+                        if not name:
+                            continue
+                        # Add satellite to our list
+                        records.append({
+                            "name": name,
+                            "line1": line1.decode('ascii', 'replace').strip(),
+                            "line2": line2.decode('ascii', 'replace').strip(),
+                            "category": self.categorize_satellite(name),
+                            "file": tle_file
+                        })
+                    tle_cache[tle_file] = {
+                        "mtime": stat.st_mtime,
+                        "size": stat.st_size,
+                        "md5": digest,
+                        "records": records
+                    }
+                    cache_dirty = True
+                    all_satellites.extend(records)
                 except Exception as e:
                     self.logger.error(f"Error reading TLE file {tle_file}: {e}")
         except Exception as e:
             self.logger.error(f"Error listing TLE files: {e}")
+
+        if cache_dirty:
+            try:
+                with open(cache_path, 'wb') as f:
+                    pickle.dump(tle_cache, f)
+            except OSError as e:
+                self.logger.warning(f"Could not write TLE cache: {e}")
         
         self.logger.info(f"Discovered {len(all_satellites)} satellites in TLE data")
         
@@ -332,20 +604,8 @@ class EnhancedSatelliteTracker:
     
     def categorize_satellite(self, name):
         """Categorize satellite based on name"""
-        name_upper = name.upper()
-        
-        if "NOAA" in name_upper:
-            return "NOAA"
-        elif "METEOR" in name_upper:
-            return "METEOR"
-        elif name_upper == "ISS" or "ISS (ZARYA)" in name_upper:
-            return "ISS"
-        elif "AO-" in name_upper or "SO-" in name_upper or "FO-" in name_upper or "XW-" in name_upper:
-            return "AMSAT"
-        elif "GOES" in name_upper:
-            return "GOES"
-        else:
-            return "OTHER"
+        match = _CATEGORY_RE.search(name.upper())
+        return match.lastgroup if match else "OTHER"
     
     def filter_and_load_satellites(self, all_satellites):
         """Filter and load satellites based on configuration"""
@@ -365,65 +625,110 @@ class EnhancedSatelliteTracker:
                 if category in categories and categories[category]:
                     filtered_satellites.append(sat_info)
         
-        # Load the filtered satellites
+        # Load the filtered satellites. Alongside the by-name dict (used by
+        # the ephem path and command handlers), the vectorized path gets a
+        # structure-of-arrays view: parallel name/frequency/mode/category
+        # arrays indexed the same way as the SatrecArray, so its inner loop
+        # reads plain array slots instead of chasing per-satellite dicts
+        self._satrec_names = []
+        satrec_list = []
+        freq_list = []
+        mode_list = []
+        cat_list = []
         for sat_info in filtered_satellites:
             try:
                 sat = ephem.readtle(sat_info["name"], sat_info["line1"], sat_info["line2"])
+                frequency = self.get_satellite_frequency(sat_info["name"])
+                mode = self.get_satellite_mode(sat_info["name"])
                 self.satellites[sat_info["name"]] = {
                     "obj": sat,
                     "category": sat_info["category"],
-                    "frequency": self.get_satellite_frequency(sat_info["name"]),
-                    "mode": self.get_satellite_mode(sat_info["name"])
+                    "frequency": frequency,
+                    "mode": mode
                 }
-                self.logger.debug(f"Loaded satellite: {sat_info['name']} ({sat_info['category']})")
+                # Also parse into a Satrec for the vectorized SGP4 path
+                if HAVE_SGP4:
+                    satrec_list.append(Satrec.twoline2rv(sat_info["line1"], sat_info["line2"]))
+                    self._satrec_names.append(sat_info["name"])
+                    freq_list.append(frequency)
+                    mode_list.append(mode)
+                    cat_list.append(_CATEGORY_CODES.get(sat_info["category"],
+                                                        _CATEGORY_CODES["OTHER"]))
+                # Skip the f-string entirely unless DEBUG is on; this line
+                # runs once per loaded TLE
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Loaded satellite: {sat_info['name']} ({sat_info['category']})")
             except Exception as e:
                 self.logger.error(f"Error loading TLE for {sat_info['name']}: {e}")
-        
+
+        # One SatrecArray propagates every satellite at every sample time in
+        # a single batched call; built once per TLE load, not per prediction
+        self._sat_array = SatrecArray(satrec_list) if HAVE_SGP4 and satrec_list else None
+        # Individual Satrecs kept for scalar evaluation when refining
+        # rise/set times between grid samples
+        self._satrecs = satrec_list
+        self._sat_modes = mode_list
+        if HAVE_SGP4:
+            self._sat_freqs = np.asarray(freq_list, dtype=np.float64)
+            self._sat_categories = np.asarray(cat_list, dtype=np.int8)
+        else:
+            self._sat_freqs = None
+            self._sat_categories = None
+
+        if self._sat_array is not None and not SGP4_ACCELERATED:
+            # The wheel ships a C extension; the pure-Python fallback is an
+            # order of magnitude slower per evaluation
+            self.logger.warning("sgp4 is running without its C extension; "
+                                "propagation will be much slower than it should be")
+
         self.logger.info(f"Loaded {len(self.satellites)} satellites for tracking")
     
     def get_satellite_frequency(self, name):
         """Get the frequency for a satellite"""
+        if name in self._freq_cache:
+            return self._freq_cache[name]
+
         frequencies = self.config.get("satellite_frequencies", {})
         # Try direct lookup
         if name in frequencies:
-            return frequencies[name]
-        
-        # Try pattern matching
-        for sat_name, freq in frequencies.items():
-            if sat_name in name or name in sat_name:
-                return freq
-        
-        # Default frequencies by category
-        name_upper = name.upper()
-        if "NOAA" in name_upper:
-            return 137.5e6  # Generic NOAA APT frequency
-        elif "METEOR" in name_upper:
-            return 137.1e6  # Generic Meteor LRPT frequency
-        elif "ISS" in name_upper:
-            return 145.8e6  # ISS voice frequency
-        elif any(prefix in name_upper for prefix in ["AO-", "SO-", "FO-", "XW-"]):
-            return 145.9e6  # Generic amateur satellite frequency
-        
-        # Unknown
-        return 0
+            freq = frequencies[name]
+        else:
+            freq = None
+            # Try pattern matching
+            for sat_name, f in frequencies.items():
+                if sat_name in name or name in sat_name:
+                    freq = f
+                    break
+
+        if freq is None:
+            # Default frequencies by category, from one scan of the name
+            match = _RADIO_RE.search(name.upper())
+            if match:
+                freq = _DEFAULT_FREQS[match.lastgroup]
+            else:
+                # Unknown
+                freq = 0
+
+        self._freq_cache[name] = freq
+        return freq
     
     def get_satellite_mode(self, name):
         """Get the operating mode for a satellite"""
+        if name in self._mode_cache:
+            return self._mode_cache[name]
+
         name_upper = name.upper()
-        
-        if "NOAA" in name_upper:
-            return "apt"
-        elif "METEOR" in name_upper:
-            return "lrpt"
-        elif "ISS" in name_upper:
-            if "APRS" in name_upper:
-                return "aprs"
-            return "voice"
-        elif any(prefix in name_upper for prefix in ["AO-", "SO-", "FO-", "XW-"]):
-            return "linear"  # Generic amateur satellite mode
-        
-        # Unknown
-        return "unknown"
+        match = _RADIO_RE.search(name_upper)
+        if match is None:
+            # Unknown
+            mode = "unknown"
+        elif match.lastgroup == "ISS":
+            mode = "aprs" if "APRS" in name_upper else "voice"
+        else:
+            mode = _DEFAULT_MODES[match.lastgroup]
+
+        self._mode_cache[name] = mode
+        return mode
     
     def update_tle_data(self):
         """Update TLE data using direct download instead of Gpredict CLI"""
@@ -445,37 +750,47 @@ class EnhancedSatelliteTracker:
             gpredict_data = os.path.join(home, ".config/Gpredict/satellites")
             os.makedirs(gpredict_data, exist_ok=True)
             
-            success_count = 0
-            for filename, url in sources.items():
-                try:
-                    self.logger.info(f"Downloading {filename} from {url}")
-                    output_path = os.path.join(gpredict_data, filename)
-                    
-                    # Download with timeout and retry
-                    max_retries = 3
-                    for attempt in range(max_retries):
-                        try:
-                            with urllib.request.urlopen(url, timeout=30) as response:
-                                tle_data = response.read()
-                            
-                            # Verify we got valid data (should contain TLE lines)
-                            if b"1 " in tle_data and b"2 " in tle_data:
-                                with open(output_path, 'wb') as f:
-                                    f.write(tle_data)
-                                success_count += 1
-                                self.logger.info(f"Successfully downloaded {filename}")
-                                break
-                            else:
-                                self.logger.warning(f"Downloaded {filename} but data appears invalid")
-                                if attempt < max_retries - 1:
-                                    time.sleep(5)  # Wait before retry
-                        except urllib.error.URLError as e:
-                            self.logger.warning(f"Attempt {attempt+1} failed for {filename}: {e}")
+            def _fetch(filename, url):
+                """Download one TLE file with retry/validation; returns True on success"""
+                self.logger.info(f"Downloading {filename} from {url}")
+                output_path = os.path.join(gpredict_data, filename)
+
+                # Download with timeout and retry
+                max_retries = 3
+                for attempt in range(max_retries):
+                    try:
+                        with urllib.request.urlopen(url, timeout=30) as response:
+                            tle_data = response.read()
+
+                        # Verify we got valid data (should contain TLE lines)
+                        if b"1 " in tle_data and b"2 " in tle_data:
+                            with open(output_path, 'wb') as f:
+                                f.write(tle_data)
+                            self.logger.info(f"Successfully downloaded {filename}")
+                            return True
+                        else:
+                            self.logger.warning(f"Downloaded {filename} but data appears invalid")
                             if attempt < max_retries - 1:
                                 time.sleep(5)  # Wait before retry
-                except Exception as e:
-                    self.logger.error(f"Error downloading {filename}: {e}")
-            
+                    except urllib.error.URLError as e:
+                        self.logger.warning(f"Attempt {attempt+1} failed for {filename}: {e}")
+                        if attempt < max_retries - 1:
+                            time.sleep(5)  # Wait before retry
+                return False
+
+            # The downloads are network-bound; fetch all six sources in
+            # parallel so the refresh takes ~one round trip instead of six
+            success_count = 0
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as executor:
+                futures = {executor.submit(_fetch, filename, url): filename
+                           for filename, url in sources.items()}
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        if future.result():
+                            success_count += 1
+                    except Exception as e:
+                        self.logger.error(f"Error downloading {futures[future]}: {e}")
+
             self.logger.info(f"TLE data updated: {success_count}/{len(sources)} files")
             return success_count > 0
         except Exception as e:
@@ -484,38 +799,256 @@ class EnhancedSatelliteTracker:
     
     def predict_passes(self):
         """Predict upcoming satellite passes"""
+        if self._sat_array is not None:
+            return self._predict_passes_sgp4()
+        return self._predict_passes_ephem()
+
+    def _predict_passes_sgp4(self):
+        """Vectorized pass prediction: one batched SGP4 call propagates every
+        satellite across the whole window, then horizon crossings are read off
+        the elevation grid"""
+        self.logger.info(f"Predicting satellite passes for the next {self.config['prediction_window']} hours (vectorized)...")
+
+        # One epoch for the whole batch: refresh the shared observer/site
+        # geometry at the same instant the time grid starts
+        now = datetime.datetime.now(datetime.UTC)
+        self.update_observer(now)
+        window_s = self.config["prediction_window"] * 3600
+        step_s = 30.0  # 30 s grid keeps the position array tens of MB, not hundreds
+
+        # Time grid as Julian date + fraction, shared by every satellite
+        jd0, fr0 = jday(now.year, now.month, now.day, now.hour, now.minute,
+                        now.second + now.microsecond * 1e-6)
+        offsets = np.arange(0.0, window_s, step_s)
+        jd = np.full(offsets.shape, jd0)
+        fr = fr0 + offsets / 86400.0
+
+        # Propagate all satellites at all times in one call: r is (Nsat, Nt, 3) TEME km
+        err, r, _ = self._sat_array.sgp4(jd, fr)
+
+        # The coarse grid only gates passes at degree-level precision (the
+        # bisection refinement stays float64), so run the geometry in
+        # float32 and halve the bandwidth through the (Nsat, Nt) arrays
+        r = r.astype(np.float32, copy=False)
+
+        # Rotate TEME -> ECEF about the z-axis by GMST (polar motion and
+        # nutation are far below the accuracy a pass schedule needs)
+        d_ut1 = (jd - 2451545.0) + fr
+        gmst = np.radians((280.46061837 + 360.98564736629 * d_ut1) % 360.0)
+        cos_g = np.cos(gmst).astype(np.float32)
+        sin_g = np.sin(gmst).astype(np.float32)
+        x = r[:, :, 0] * cos_g + r[:, :, 1] * sin_g
+        y = -r[:, :, 0] * sin_g + r[:, :, 1] * cos_g
+        z = r[:, :, 2]
+
+        # Observer site geometry is precomputed in update_observer and
+        # shared by every satellite
+        ox, oy, oz = self._site_ecef
+        sin_lat, cos_lat, sin_lon, cos_lon = self._site_trig
+
+        # Elevation: angle between the range vector and the local horizon
+        rx, ry, rz = x - ox, y - oy, z - oz
+        zenith = (cos_lat * cos_lon * rx +
+                  cos_lat * sin_lon * ry +
+                  sin_lat * rz)
+        rng = np.sqrt(rx * rx + ry * ry + rz * rz)
+        elev = np.degrees(np.arcsin(zenith / rng))
+        elev[err != 0] = -90.0  # Propagation errors count as below horizon
+
+        # Anchor pass epochs to the same instant the time grid was built
+        # from; sampling the clock here instead would skew every timestamp
+        # late by however long the propagation above took
+        base_epoch = now.timestamp()
+        self.scheduled_passes = []
+        pass_cats = []  # Category code per accepted pass, for scoring
+
+        # Horizon crossings for every satellite in one diff over the whole
+        # (Nsat, Nt) mask: +1 edges are rises, -1 edges are sets. np.where
+        # scans row-major, so the row arrays come out sorted and a
+        # searchsorted per satellite slices out its own crossings
+        above = elev > 0.0
+        edges = np.diff(above.astype(np.int8), axis=1)
+        rise_rows, rise_cols = np.where(edges == 1)
+        set_rows, set_cols = np.where(edges == -1)
+
+        for i, sat_name in enumerate(self._satrec_names):
+            category = _CATEGORIES[self._sat_categories[i]]
+            frequency = float(self._sat_freqs[i])
+            mode = self._sat_modes[i]
+
+            r_lo, r_hi = np.searchsorted(rise_rows, (i, i + 1))
+            s_lo, s_hi = np.searchsorted(set_rows, (i, i + 1))
+            # +1 converts the edge position to the first sample past it
+            rises = rise_cols[r_lo:r_hi] + 1
+            sets = set_cols[s_lo:s_hi] + 1
+
+            # A set with no prior rise is a pass already in progress at the
+            # window start; skip it. Rises and sets then alternate, so they
+            # pair index-for-index (a trailing unmatched rise is still above
+            # the horizon at the window end and is dropped)
+            if sets.size and (rises.size == 0 or sets[0] < rises[0]):
+                sets = sets[1:]
+
+            pass_count = 0
+            for rise_idx, set_idx in zip(rises, sets):
+                segment = elev[i, rise_idx:set_idx]
+                max_elevation = float(segment.max())
+                duration = (set_idx - rise_idx) * step_s
+
+                if max_elevation > self.config["min_elevation"] and duration > self.config["min_duration"]:
+                    # Sharpen the grid-resolution crossings: bisect the
+                    # bracketing samples down to sub-second rise/set times
+                    satrec = self._satrecs[i]
+                    rise_t = self._refine_crossing(satrec, jd0, fr0,
+                                                   (rise_idx - 1) * step_s, rise_idx * step_s)
+                    set_t = self._refine_crossing(satrec, jd0, fr0,
+                                                  (set_idx - 1) * step_s, set_idx * step_s)
+                    rise_ts = base_epoch + rise_t
+                    set_ts = base_epoch + set_t
+                    duration = set_t - rise_t
+                    max_ts = base_epoch + (rise_idx + int(segment.argmax())) * step_s
+                    rise_time = datetime.datetime.fromtimestamp(rise_ts)
+                    set_time = datetime.datetime.fromtimestamp(set_ts)
+                    max_time = datetime.datetime.fromtimestamp(max_ts)
+
+                    pass_id = f"{sat_name}_{rise_time.strftime('%Y%m%d_%H%M%S')}"
+
+                    # Priority is filled in by one vectorized scoring pass
+                    # over the whole schedule after discovery
+                    self.scheduled_passes.append({
+                        "id": pass_id,
+                        "satellite": sat_name,
+                        "category": category,
+                        "frequency": frequency,
+                        "mode": mode,
+                        "rise_time": rise_time.isoformat(),
+                        "max_time": max_time.isoformat(),
+                        "set_time": set_time.isoformat(),
+                        "rise_ts": rise_ts,
+                        "max_ts": max_ts,
+                        "set_ts": set_ts,
+                        "rise_dt": rise_time,
+                        "set_dt": set_time,
+                        "max_elevation": max_elevation,
+                        "duration": duration
+                    })
+                    pass_cats.append(self._sat_categories[i])
+                    self.logger.info(f"Scheduled pass for {sat_name} at {rise_time.strftime('%Y-%m-%d %H:%M:%S')}, "
+                            f"max elevation: {max_elevation:.1f}°, duration: {duration/60:.1f}min")
+                    pass_count += 1
+
+            if pass_count > 0:
+                self.logger.info(f"Found {pass_count} passes for {sat_name}")
+
+        # Score every pass in one vectorized expression instead of a
+        # Python call per pass; same formula as calculate_pass_priority
+        if self.scheduled_passes:
+            p_elev = np.array([p["max_elevation"] for p in self.scheduled_passes])
+            p_dur = np.array([p["duration"] for p in self.scheduled_passes])
+            scores = np.round((np.minimum(p_elev / 10, 10) * 0.6 +
+                               np.minimum(p_dur / 120, 10) * 0.4) *
+                              _CAT_MULT[np.array(pass_cats, dtype=np.intp)], 1)
+            for pass_info, score in zip(self.scheduled_passes, scores):
+                pass_info["priority"] = float(score)
+
+        return self._finalize_schedule()
+
+    def _sgp4_elevation(self, satrec, jd0, fr0, t_s):
+        """Elevation in degrees of one satellite t_s seconds after jd0+fr0.
+
+        Scalar twin of the grid math in _predict_passes_sgp4: propagate,
+        rotate TEME->ECEF by GMST, project the range vector onto the zenith.
+        """
+        fr = fr0 + t_s / 86400.0
+        err, r, _ = satrec.sgp4(jd0, fr)
+        if err != 0:
+            return -90.0
+        d_ut1 = (jd0 - 2451545.0) + fr
+        gmst = math.radians((280.46061837 + 360.98564736629 * d_ut1) % 360.0)
+        cos_g, sin_g = math.cos(gmst), math.sin(gmst)
+        x = r[0] * cos_g + r[1] * sin_g
+        y = -r[0] * sin_g + r[1] * cos_g
+        z = r[2]
+        ox, oy, oz = self._site_ecef
+        sin_lat, cos_lat, sin_lon, cos_lon = self._site_trig
+        rx, ry, rz = x - ox, y - oy, z - oz
+        zenith = cos_lat * cos_lon * rx + cos_lat * sin_lon * ry + sin_lat * rz
+        rng = math.sqrt(rx * rx + ry * ry + rz * rz)
+        return math.degrees(math.asin(zenith / rng))
+
+    def _refine_crossing(self, satrec, jd0, fr0, t_lo, t_hi):
+        """Bisect a horizon crossing bracketed by two grid samples.
+
+        Nine halvings take the 30 s bracket below 0.1 s, a handful of
+        scalar SGP4 calls per accepted pass.
+        """
+        e_lo = self._sgp4_elevation(satrec, jd0, fr0, t_lo)
+        for _ in range(9):
+            t_mid = 0.5 * (t_lo + t_hi)
+            e_mid = self._sgp4_elevation(satrec, jd0, fr0, t_mid)
+            if (e_mid > 0.0) == (e_lo > 0.0):
+                t_lo, e_lo = t_mid, e_mid
+            else:
+                t_hi = t_mid
+        return 0.5 * (t_lo + t_hi)
+
+    def _predict_passes_ephem(self):
+        """Predict upcoming satellite passes with the per-satellite PyEphem loop"""
         self.logger.info(f"Predicting satellite passes for the next {self.config['prediction_window']} hours...")
         
-        # Update observer with current time
-        self.update_observer()
-        
+        # Compute "now" once so every satellite is predicted from the same
+        # epoch, then update the observer with it
+        now = datetime.datetime.now(datetime.UTC)
+        self.update_observer(now)
+
         # Calculate the end of our prediction window
-        end_time = datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=self.config["prediction_window"])
+        end_time = now + datetime.timedelta(hours=self.config["prediction_window"])
         
         # Clear the existing scheduled passes
         self.scheduled_passes = []
-        
+
+        end_date = ephem.Date(end_time)
+        observer_lat = abs(self.config["observer"]["lat"])
+
         for sat_name, sat_data in self.satellites.items():
             try:
-                # Set observer time to now for initial prediction
-                self.observer.date = datetime.datetime.now(datetime.UTC)
-                
+                # Rewind observer time to the shared epoch for this
+                # satellite's first prediction
+                self.observer.date = now
+
                 # Get the satellite object
                 sat = sat_data["obj"]
-                
+
+                # Skip orbits that can never clear the elevation cutoff at
+                # this latitude. The linear bound overestimates the reachable
+                # elevation, so it only drops satellites that truly can't
+                # qualify; retrograde inclinations fold around 90°
+                inc = getattr(sat, "_inc", None)
+                if inc is not None:
+                    inc_deg = math.degrees(inc)
+                    inc_eff = min(inc_deg, 180.0 - inc_deg)
+                    max_reachable = 90.0 - max(0.0, observer_lat - inc_eff)
+                    if max_reachable < self.config["min_elevation"]:
+                        continue
+
                 # Predict passes until we reach the end of our window
                 pass_count = 0
-                
+
                 while True:
                     try:
                         next_pass = self.observer.next_pass(sat)
-                        
+
+                        # Rises beyond the window can't produce a schedulable
+                        # pass; stop before doing any conversion work
+                        if next_pass[0] > end_date:
+                            break
+
                         # Extract the pass details
                         rise_time = ephem.localtime(next_pass[0])
                         max_time = ephem.localtime(next_pass[2])
                         set_time = ephem.localtime(next_pass[4])
-                        max_elevation = next_pass[3] * 180 / 3.14159  # Convert to degrees
-                        duration = (next_pass[4] - next_pass[0]) * 24 * 60 * 60  # Duration in seconds
+                        max_elevation = float(next_pass[3]) * _DEG  # Convert to degrees
+                        duration = (next_pass[4] - next_pass[0]) * _SEC_PER_DAY  # Duration in seconds
                         
                         # Check if the pass meets our criteria and is within our window
                         if (max_elevation > self.config["min_elevation"] and 
@@ -526,7 +1059,8 @@ class EnhancedSatelliteTracker:
                             pass_id = f"{sat_name}_{rise_time.strftime('%Y%m%d_%H%M%S')}"
                             
                             # Calculate priority based on elevation and duration
-                            priority = self.calculate_pass_priority(max_elevation, duration, sat_name, sat_data)
+                            priority = self.calculate_pass_priority(max_elevation, duration, sat_name,
+                                                                    sat_data["category"])
                             
                             # Add pass to our schedule
                             pass_info = {
@@ -538,6 +1072,11 @@ class EnhancedSatelliteTracker:
                                 "rise_time": rise_time.isoformat(),
                                 "max_time": max_time.isoformat(),
                                 "set_time": set_time.isoformat(),
+                                "rise_ts": rise_time.timestamp(),
+                                "max_ts": max_time.timestamp(),
+                                "set_ts": set_time.timestamp(),
+                                "rise_dt": rise_time,
+                                "set_dt": set_time,
                                 "max_elevation": max_elevation,
                                 "duration": duration,
                                 "priority": priority
@@ -551,9 +1090,9 @@ class EnhancedSatelliteTracker:
                         
                         # Set observer time to just after this pass for next prediction
                         self.observer.date = ephem.Date(next_pass[4] + ephem.minute)
-                        
+
                         # If we've gone past our window, break
-                        if self.observer.date > ephem.Date(end_time):
+                        if self.observer.date > end_date:
                             break
                             
                     except Exception as e:
@@ -566,34 +1105,61 @@ class EnhancedSatelliteTracker:
             except Exception as e:
                 self.logger.error(f"Error in pass prediction for {sat_name}: {e}")
         
-        # Sort passes by time
+        return self._finalize_schedule()
+
+    def _finalize_schedule(self):
+        """Sort, log and publish the freshly predicted pass schedule"""
+        # Sort passes by time and rewind the next-pass pointer for the
+        # fresh schedule
         self.scheduled_passes.sort(key=lambda x: x["rise_time"])
-        
-        # Add human-readable times for better logging
+        self._next_idx = 0
+        # Parallel key list so the pointer can jump straight to the next
+        # pass yet to rise with one bisect instead of stepping per tick;
+        # rise times are what the list is sorted by, so the keys are
+        # monotone even when passes overlap
+        self._rise_ts_keys = [p["rise_ts"] for p in self.scheduled_passes]
+
+        # Add human-readable times for better logging; the datetimes are
+        # already stashed on the pass, so no ISO re-parse here. Each pass
+        # also gets its compact MQTT row built once: satellite and category
+        # become small table indices, times are epoch floats, so
+        # publish_schedule ships a fraction of the old dict-per-pass bytes
         for pass_info in self.scheduled_passes:
-            rise_dt = datetime.datetime.fromisoformat(pass_info["rise_time"])
-            set_dt = datetime.datetime.fromisoformat(pass_info["set_time"])
-            pass_info["readable_time"] = f"{rise_dt.strftime('%Y-%m-%d %H:%M')} to {set_dt.strftime('%H:%M')}"
-        
+            pass_info["readable_time"] = (f"{pass_info['rise_dt'].strftime('%Y-%m-%d %H:%M')} "
+                                          f"to {pass_info['set_dt'].strftime('%H:%M')}")
+            sat_name = pass_info["satellite"]
+            sat_id = self._sat_table.get(sat_name)
+            if sat_id is None:
+                sat_id = self._sat_table[sat_name] = len(self._sat_table_names)
+                self._sat_table_names.append(sat_name)
+            pass_info["_row"] = [
+                sat_id,
+                _CATEGORY_CODES.get(pass_info["category"], _CATEGORY_CODES["OTHER"]),
+                round(pass_info["rise_ts"], 1),
+                round(pass_info["set_ts"], 1),
+                round(pass_info["max_elevation"], 1),
+                pass_info["priority"]
+            ]
+
         # Log the complete schedule
         self.logger.info("Complete pass schedule:")
         for idx, pass_info in enumerate(self.scheduled_passes):
             self.logger.info(f"{idx+1}. {pass_info['satellite']} ({pass_info['category']}) - {pass_info['readable_time']} - "
                         f"Max elevation: {pass_info['max_elevation']:.1f}° - Priority: {pass_info['priority']}")
-        
+
         # Use the new optimized schedule publishing method instead of direct publishing
         self.publish_schedule()
-        
+
         # Return the number of passes found
         return len(self.scheduled_passes)
     
-    def calculate_pass_priority(self, elevation, duration, satellite, sat_data):
+    def calculate_pass_priority(self, elevation, duration, satellite, category):
         """Calculate priority score for a pass based on quality"""
         # Higher elevations and longer durations get higher priority
         # Scale from 1-10 where 10 is highest priority
         elevation_score = min(10, elevation / 10)  # 10 = 90+ degrees
         duration_score = min(10, duration / 120)  # 10 = 20+ minutes
-        
+
         # Base multiplier by category
         category_priority = {
             "NOAA": 1.2,    # NOAA satellites are easy to receive
@@ -603,10 +1169,7 @@ class EnhancedSatelliteTracker:
             "GOES": 0.8,    # GOES requires specialized equipment
             "OTHER": 0.7    # Other satellites may not have useful signals
         }
-        
-        # Get category
-        category = sat_data["category"]
-        
+
         # Apply category multiplier
         cat_multiplier = category_priority.get(category, 1.0)
         
@@ -620,27 +1183,23 @@ class EnhancedSatelliteTracker:
         if not self.scheduled_passes:
             return False
             
-        # Get current time with timezone info
-        now = datetime.datetime.now(datetime.timezone.utc).astimezone()
-        now_str = now.isoformat()
-        
-        # Find the next upcoming pass
-        next_pass = None
-        for pass_info in self.scheduled_passes:
-            if pass_info["rise_time"] > now_str:
-                next_pass = pass_info
-                break
-        
+        # Passes carry float POSIX timestamps, so a single time.time() call
+        # replaces the ISO round-trip (fromisoformat + tzinfo fixup) per tick
+        now_ts = time.time()
+
+        # The schedule is sorted by rise time, so a monotonic pointer
+        # replaces the linear scan each tick: one bisect jumps straight to
+        # the first pass that hasn't risen yet, skipping elapsed and
+        # in-progress passes alike — neither needs preparation, and with
+        # overlapping passes the next one to rise is what matters
+        self._next_idx = bisect.bisect_right(
+            self._rise_ts_keys, now_ts, self._next_idx)
+        idx = self._next_idx
+
+        next_pass = self.scheduled_passes[idx] if idx < len(self.scheduled_passes) else None
+
         if next_pass:
-            # Calculate time until pass with proper timezone handling
-            rise_time = datetime.datetime.fromisoformat(next_pass["rise_time"])
-            
-            # If rise_time doesn't have timezone info, add it
-            if rise_time.tzinfo is None:
-                # Add the same timezone as now
-                rise_time = rise_time.replace(tzinfo=now.tzinfo)
-            
-            time_until_pass = (rise_time - now).total_seconds()
+            time_until_pass = next_pass["rise_ts"] - now_ts
             
             # Check if this is a new pass to prepare for
             if self.next_pass_time != next_pass["rise_time"]:
@@ -651,8 +1210,10 @@ class EnhancedSatelliteTracker:
             # If the pass is soon, send power-on command to Arduino
             if time_until_pass < 2 * 60 and time_until_pass > 0:  # 2 minutes before pass
                 self.prepare_for_pass(next_pass, time_until_pass)
+                # Push out whatever preparation queued, coalesced per topic
+                self._flush_pending_pubs()
                 return True
-                
+
         return False
     
     def prepare_for_pass(self, pass_info, time_until_pass):
@@ -663,38 +1224,34 @@ class EnhancedSatelliteTracker:
         # Check if we've already prepared for this pass
         if pass_id in self.tracked_passes:
             return
-        
-        # Check if this satellite should trigger notifications
-        should_notify = False
-        cmd_code = 0
-        if "notification_satellites" in self.config:
-            # If notification_satellites is defined, check if this satellite is in the list
-            should_notify = satellite_name in self.config["notification_satellites"]
-
-            if satellite_name == "NOAA 15":
-                cmd_code = 105
-            
-            elif satellite_name == "NOAA 18":
-                cmd_code = 106
-            
-            elif satellite_name == "NOAA 19":
-                cmd_code = 107
-            
-            elif satellite_name == "ISS (ZARYA)":
-                cmd_code = 108
-
 
+        # Re-verify the pass is actually inside the preparation window before
+        # doing any real work: redundant polls can hand us a pass that is
+        # still comfortably in the future, and bailing here skips the dict
+        # builds and MQTT publishes entirely (30s of slack for timer jitter).
+        # Compare epoch floats like the caller does; rise_dt is naive local
+        # time and would blow up against an aware now()
+        prep_lead_s = self.config.get("prep_lead_minutes", 10) * 60
+        if pass_info["rise_ts"] - time.time() > prep_lead_s + 30:
+            return
 
+        # Check if this satellite should trigger notifications: one frozenset
+        # membership test and one dict lookup instead of the old if/elif chain
+        if self._notify_set is not None:
+            should_notify = satellite_name in self._notify_set
+            cmd_code = SATELLITE_CMD_CODES.get(satellite_name, 0)
         else:
             # If notification_satellites is not defined, notify for all passes (legacy behavior)
             should_notify = True
+            cmd_code = 0
         
         # Log the preparation but only notify if it's in the notification list
         self.logger.info(f"Preparing for pass {pass_id} in {time_until_pass/60:.1f} minutes")
         
-        # Calculate optimal start time (a few minutes before actual rise)
-        start_time = datetime.datetime.fromisoformat(pass_info["rise_time"]) - datetime.timedelta(minutes=2)
-        end_time = datetime.datetime.fromisoformat(pass_info["set_time"]) + datetime.timedelta(minutes=1)
+        # Calculate optimal start time (a few minutes before actual rise);
+        # the pass carries its datetimes, so no fromisoformat round-trip
+        start_time = pass_info["rise_dt"] - datetime.timedelta(minutes=2)
+        end_time = pass_info["set_dt"] + datetime.timedelta(minutes=1)
         
         # Create the pass parameters
         pass_params = {
@@ -714,17 +1271,17 @@ class EnhancedSatelliteTracker:
             self.logger.info(f"Sending MQTT notifications for {satellite_name} pass")
             
             # Send power-on command to Arduino if configured
-            if "power_control_topic" in self.config["mqtt"]:
+            if self._power_topic is not None:
                 power_message = {
                     "command": "power_on",
                     "reason": f"Preparing for {satellite_name} pass",
                     "code": cmd_code,
                     "scheduled_time": start_time.isoformat(),
-                    "duration_estimate": int(pass_info["duration"])  
+                    "duration_estimate": int(pass_info["duration"])
                     # Add 3 minutes for setup - 180 - JK
                 }
-                
-                self.publish_message(self.config["mqtt"]["power_control_topic"], power_message)
+
+                self._pending_pubs.append((self._power_topic, power_message))
             
             # Schedule the pass with the field Pi
             schedule_message = {
@@ -732,7 +1289,7 @@ class EnhancedSatelliteTracker:
                 "pass": pass_params
             }
             
-            self.publish_message("command", schedule_message)
+            self._pending_pubs.append(("command", schedule_message))
         else:
             self.logger.info(f"Skipping MQTT notifications for {satellite_name} (not in notification list)")
         
@@ -744,91 +1301,170 @@ class EnhancedSatelliteTracker:
             "scheduled_start": start_time.isoformat(),
             "notified": should_notify
         }
-    
-    def publish_message(self, topic, message):
-        # Format topic if needed
-        if isinstance(topic, str) and not topic.startswith(self.config['mqtt']['topic_prefix']):
-            if "power_control_topic" in self.config['mqtt'] and topic == self.config['mqtt']['power_control_topic']:
-                # Don't modify power control topic
-                pass
+
+    def _flush_pending_pubs(self):
+        """Send the messages queued during this tick, one publish per topic.
+
+        A lone message keeps the plain wire format; when several passes
+        rise in the same tick, their messages for a topic share one packet
+        as {"batch": [...]} instead of paying per-message framing.
+        """
+        if not self._pending_pubs:
+            return
+        pending, self._pending_pubs = self._pending_pubs, []
+        by_topic = {}
+        for topic, message in pending:
+            by_topic.setdefault(topic, []).append(message)
+        for topic, messages in by_topic.items():
+            if len(messages) == 1:
+                self.publish_message(topic, messages[0])
             else:
-                topic = f"{self.config['mqtt']['topic_prefix']}{topic}"
-        
-        # Convert message to JSON if it's not already a string
+                self.publish_message(topic, {"batch": messages})
+
+    def _now_iso(self):
+        """Current wall time as an ISO string, cached per whole second
+
+        Outgoing JSON only ever stamps messages to second precision, so
+        bursty publishes (batch streams, status floods) reuse one
+        formatted string instead of paying now().isoformat() each time.
+        """
+        t = int(time.time())
+        if t != self._iso_t:
+            self._iso_t = t
+            self._iso_s = datetime.datetime.fromtimestamp(t).isoformat()
+        return self._iso_s
+
+    def publish_message(self, topic, message, qos=None):
+        # Resolve the short topic name to its full form; almost always a
+        # single dict hit, with unseen topics resolved once and memoized
+        resolved = self._resolved_topics.get(topic)
+        if resolved is None:
+            resolved = topic
+            if isinstance(topic, str) and not topic.startswith(self._topic_prefix):
+                if topic != self._power_topic:  # Don't modify power control topic
+                    resolved = f"{self._topic_prefix}{topic}"
+            self._resolved_topics[topic] = resolved
+        topic = resolved
+        
+        # Serialize straight to UTF-8 bytes into the reusable per-thread
+        # buffer: paho gets one bytes() snapshot at the end, and the size
+        # check below is just len() of the buffer — no str round-trip and
+        # no second encode of the payload anywhere on this path
+        buf = _payload_buf()
         if not isinstance(message, str):
-            message_json = json.dumps(message)
+            buf += _dumps(message)
         else:
-            message_json = message
-        
+            buf += message.encode('utf-8')
+
         # Check payload size against Shiftr.io's 64KB limit
-        max_size = self.config['mqtt'].get('max_payload_size', 65000)
-        payload_size = len(message_json.encode('utf-8'))
-        
+        max_size = self._max_payload_size
+        payload_size = len(buf)
+
         if payload_size > max_size:
             self.logger.warning(f"Message for {topic} too large ({payload_size} bytes), truncating")
-            
-            # Handle schedule message specially
-            if isinstance(message, dict) and "passes" in message and isinstance(message["passes"], list):
-                # Trim passes until it fits
-                while len(json.dumps(message).encode('utf-8')) > max_size and len(message["passes"]) > 0:
-                    message["passes"].pop()
-                message_json = json.dumps(message)
+
+            # Handle schedule messages specially: "p" holds the compact
+            # rows, "passes" the legacy full dicts
+            pass_key = None
+            if isinstance(message, dict):
+                if isinstance(message.get("p"), list):
+                    pass_key = "p"
+                elif isinstance(message.get("passes"), list):
+                    pass_key = "passes"
+            if pass_key is not None:
+                # Binary-search the largest pass count that fits: O(log N)
+                # serializations instead of one per popped pass
+                passes = message[pass_key]
+                lo, hi = 0, len(passes)
+                while lo < hi:
+                    mid = (lo + hi + 1) // 2
+                    message[pass_key] = passes[:mid]
+                    if len(_dumps(message)) > max_size:
+                        hi = mid - 1
+                    else:
+                        lo = mid
+                message[pass_key] = passes[:lo]
+                buf.clear()
+                buf += _dumps(message)
             else:
-                # Simple truncation
-                message_json = message_json[:max_size]
-        
-        # Get QoS from config or use safe default for Shiftr.io
-        qos = self.config['mqtt'].get('qos', 0)
-        
+                # Simple truncation, in place
+                del buf[max_size:]
+
+        # Get QoS from config or use safe default for Shiftr.io; callers
+        # can force a level for topics that tolerate loss
+        if qos is None:
+            qos = self._qos
+
+        # Count the message against the in-flight window before handing it
+        # to paho: on_publish fires on the network thread and can beat a
+        # post-publish increment, which would skip the guarded decrement
+        # and leak the counter upward until the window jammed shut. The
+        # failed paths below undo the count since no on_publish will come
+        with self._inflight_lock:
+            self._inflight += 1
+            if self._inflight >= 20:
+                self._pub_window.clear()
+
         # Publish with appropriate settings
         try:
             result = self.mqtt_client.publish(
                 topic,
-                message_json,
+                bytes(buf),
                 qos=qos,
                 retain=False
             )
-            
+
             if result.rc != mqtt.MQTT_ERR_SUCCESS:
                 self.logger.error(f"Failed to publish to {topic}, result code: {result.rc}")
+                self._uncount_inflight()
                 return False
-            
+
             return True
         except Exception as e:
             self.logger.error(f"Error publishing to MQTT topic {topic}: {e}")
+            self._uncount_inflight()
             return False
+
+    def _uncount_inflight(self):
+        """Back out an in-flight count for a publish that never went out"""
+        with self._inflight_lock:
+            if self._inflight > 0:
+                self._inflight -= 1
+            if self._inflight <= 10:
+                self._pub_window.set()
         
     def publish_schedule(self):
         """Publish satellite pass schedule with size optimization"""
-        # Start with a small subset of passes (next 10-20)
-        limited_passes = self.scheduled_passes[:15]
-        
-        # Remove unnecessary fields to reduce size
-        simplified_passes = []
-        for pass_info in limited_passes:
-            simplified = {
-                "id": pass_info["id"],
-                "satellite": pass_info["satellite"],
-                "category": pass_info["category"],
-                "rise_time": pass_info["rise_time"],
-                "set_time": pass_info["set_time"],
-                "max_elevation": pass_info["max_elevation"],
-                "priority": pass_info["priority"]
-            }
-            simplified_passes.append(simplified)
-        
-        # Prepare and publish the smaller message
+        # Start with a small subset of passes (next 10-20); the compact
+        # per-pass rows were built once when the schedule was finalized,
+        # and islice avoids materializing an intermediate list slice
+        rows = list(islice((p["_row"] for p in self.scheduled_passes), 15))
+
+        # Skip the publish entirely when the schedule content is identical
+        # to what was last sent; the digest covers the passes, not the
+        # ever-changing 'updated' stamp
+        digest = hashlib.md5(_dumps(rows)).digest()
+        if digest == self._last_schedule_hash:
+            self.logger.debug("Schedule unchanged since last publish; skipping")
+            return True
+
+        # Compact envelope: "t"/"c" are the satellite and category lookup
+        # tables, "p" holds [sat_id, cat_id, rise_ts, set_ts, max_el, prio]
+        # rows that subscribers decode against them
         schedule_message = {
-            "passes": simplified_passes,
+            "t": self._sat_table_names,
+            "c": list(_CATEGORIES),
+            "p": rows,
             "total_passes": len(self.scheduled_passes),
-            "updated": datetime.datetime.now().isoformat(),
-            "location": {
-                "lat": self.config["observer"]["lat"],
-                "lon": self.config["observer"]["lon"]
-            }
+            "updated": self._now_iso()
         }
-        
-        return self.publish_message("schedule", schedule_message)
+
+        # Schedule is republished on every prediction cycle, so a lost one
+        # is harmless: QoS 0 regardless of the configured default
+        published = self.publish_message("schedule", schedule_message, qos=0)
+        if published:
+            self._last_schedule_hash = digest
+        return published
     
     def publish_large_data(self, topic, data, batch_size=10):
         """Publish large datasets by splitting into multiple messages"""
@@ -852,22 +1488,26 @@ class EnhancedSatelliteTracker:
                 "data": batch
             }
             
-            success = self.publish_message(f"{topic}/batch", batch_message)
+            # Bulk data is non-critical; keep the stream at QoS 0 so the
+            # in-flight window drains as fast as the broker allows
+            success = self.publish_message(f"{topic}/batch", batch_message, qos=0)
             if not success:
                 self.logger.error(f"Failed to publish batch {batch_num} to {topic}")
                 return False
-            
-            # Short delay between batches to avoid overwhelming the broker
-            time.sleep(0.5)
+
+            # Only pause when the in-flight window is full; the publish
+            # rate is then bounded by the broker, not a fixed sleep
+            if not self._pub_window.wait(timeout=5):
+                self.logger.warning(f"Publish window stayed full while batching to {topic}")
         
         # Send completion message
         completion = {
             "status": "complete",
             "total_items": total_items,
             "total_batches": total_batches,
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": self._now_iso()
         }
-        return self.publish_message(f"{topic}/complete", completion)
+        return self.publish_message(f"{topic}/complete", completion, qos=0)
     
     def run(self):
         """Main loop to continuously check for satellite passes"""
@@ -878,44 +1518,61 @@ class EnhancedSatelliteTracker:
             num_passes = self.predict_passes()
             self.logger.info(f"Found {num_passes} passes for the next {self.config['prediction_window']} hours")
             
-            last_prediction_time = datetime.datetime.now()
-            last_tle_update_time = last_prediction_time
-            
+            # Interval timers run on the monotonic clock: no datetime
+            # allocation per tick and immune to wall-clock jumps/DST
+            last_prediction_mono = time.monotonic()
+            last_tle_update_mono = last_prediction_mono
+
             while True:
                 # Check for upcoming passes
                 self.check_upcoming_passes()
-                
-                current_time = datetime.datetime.now()
-                
+
+                now_mono = time.monotonic()
+
                 # Update TLE data daily
-                if (current_time - last_tle_update_time).total_seconds() > 24 * 3600:
+                if now_mono - last_tle_update_mono > 24 * 3600:
                     self.logger.info("Performing daily TLE update")
                     self.update_tle_data()
                     self.discover_satellites()  # Rediscover satellites with new TLE data
-                    last_tle_update_time = current_time
-                    
+                    last_tle_update_mono = now_mono
+
                     # Force prediction update after TLE update
                     self.predict_passes()
-                    last_prediction_time = current_time
-                
+                    last_prediction_mono = now_mono
+
                 # Re-predict passes every 6 hours or when we have none scheduled
-                elif (current_time - last_prediction_time).total_seconds() > 6 * 3600 or not self.scheduled_passes:
+                elif now_mono - last_prediction_mono > 6 * 3600 or not self.scheduled_passes:
                     self.predict_passes()
-                    last_prediction_time = current_time
-                
-                time.sleep(self.config["check_interval"])
+                    last_prediction_mono = now_mono
+
+                # Sleep until something actually needs us: when the next
+                # pass's 2-minute prep lead is far off, stretch the sleep
+                # toward it (bounded by the prediction and TLE deadlines)
+                # instead of waking every check_interval to do nothing
+                sleep_s = float(self.config["check_interval"])
+                now_ts = time.time()
+                idx = self._next_idx
+                if (idx < len(self.scheduled_passes) and
+                        self.scheduled_passes[idx]["rise_ts"] > now_ts):
+                    until_prep = self.scheduled_passes[idx]["rise_ts"] - 120.0 - now_ts
+                    if until_prep > sleep_s:
+                        sleep_s = until_prep
+                now_mono = time.monotonic()
+                sleep_s = min(sleep_s, max(1.0, 6 * 3600 - (now_mono - last_prediction_mono)))
+                sleep_s = min(sleep_s, max(1.0, 24 * 3600 - (now_mono - last_tle_update_mono)))
+                time.sleep(max(1.0, sleep_s))
                 
         except KeyboardInterrupt:
             self.logger.info("Satellite tracker stopped by user")
             # Publish offline status
-            self.publish_message("status", {"status": "offline", "timestamp": datetime.datetime.now().isoformat()})
+            self.publish_message("status", {"status": "offline", "timestamp": self._now_iso()})
             self.mqtt_client.loop_stop()
             self.mqtt_client.disconnect()
         except Exception as e:
             self.logger.error(f"Error in main loop: {e}")
             # Try to publish error status
             try:
-                self.publish_message("status", {"status": "error", "message": str(e), "timestamp": datetime.datetime.now().isoformat()})
+                self.publish_message("status", {"status": "error", "message": str(e), "timestamp": self._now_iso()})
             except:
                 pass
 